@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import mmap
+import argparse
+import operator
+import contextlib
+import collections
+import concurrent.futures
+
+CHUNK_SIZE = 1 << 24
+
+Column = collections.namedtuple('Column', 'src dst fixed')
+
+def parse_column(arg):
+    if isinstance(arg, Column):
+        return arg
+    spec, _, fixed = arg.partition('=')
+    src, _, dst = spec.partition(':')
+    return Column(src, dst or src, fixed or None)
+
+class Projection:
+    def __init__(self, header, columns, lower=True):
+        names = header.split()
+        self.ncols = len(names)
+        self.lower = lower
+        self.constants = []
+        self.indexes = []
+        for column in columns:
+            if column.fixed is not None:
+                self.indexes.append(self.ncols + len(self.constants))
+                self.constants.append(column.fixed.encode('utf8'))
+            elif column.src.encode('utf8') in names:
+                self.indexes.append(names.index(column.src.encode('utf8')))
+            else:
+                raise ValueError('no such column: %s' % column.src)
+        self.header = ' '.join(column.dst for column in columns).encode('utf8') + b'\n'
+
+    def __call__(self, data):
+        if self.lower:
+            data = data.lower()
+        select = operator.itemgetter(*self.indexes)
+        single = len(self.indexes) == 1
+        constants = self.constants
+        ncols = self.ncols
+        lines = []
+        skipped = []
+        for line in data.splitlines():
+            fields = line.split()
+            if len(fields) != ncols:
+                skipped.append(len(fields))
+                continue
+            if constants:
+                fields += constants
+            lines.append(select(fields) if single else b' '.join(select(fields)))
+        if lines:
+            lines.append(b'')
+        return b'\n'.join(lines), skipped
+
+def project_range(projection, path, start, end):
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return projection(buffer[start:end])
+
+def line_ranges(buffer, start, chunk_size):
+    size = len(buffer)
+    while start < size:
+        end = min(start + chunk_size, size)
+        if end < size:
+            newline = buffer.find(b'\n', end - 1)
+            end = size if newline < 0 else newline + 1
+        yield start, end
+        start = end
+
+def read_blocks(stream, chunk_size):
+    rest = b''
+    while True:
+        block = stream.read(chunk_size)
+        if not block:
+            break
+        block = rest + block
+        newline = block.rfind(b'\n')
+        if newline < 0:
+            rest = block
+            continue
+        rest = block[newline+1:]
+        yield block[:newline+1]
+    if rest:
+        yield rest
+
+def map_mmap(source):
+    try:
+        if isinstance(source, (str, bytes, os.PathLike)):
+            with open(source, 'rb') as f:
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+    except (ValueError, OSError, AttributeError):
+        return None
+
+def split_header(data):
+    newline = data.find(b'\n')
+    if newline < 0:
+        return data, len(data)
+    return data[:newline], newline + 1
+
+def submit_chunks(executor, source, columns, chunk_size, lower):
+    is_path = isinstance(source, (str, bytes, os.PathLike))
+    buffer = map_mmap(source)
+    if buffer is not None:
+        with buffer:
+            header, start = split_header(buffer)
+            projection = Projection(header, columns, lower)
+            yield projection
+            for start, end in line_ranges(buffer, start, chunk_size):
+                if is_path:
+                    yield executor.submit(project_range, projection, source, start, end)
+                else:
+                    yield executor.submit(projection, buffer[start:end])
+        return
+    with open(source, 'rb') if is_path else contextlib.nullcontext(source) as stream:
+        blocks = read_blocks(stream, chunk_size)
+        first = next(blocks, b'')
+        if not first:
+            return
+        header, start = split_header(first)
+        projection = Projection(header, columns, lower)
+        yield projection
+        if start < len(first):
+            yield executor.submit(projection, first[start:])
+        for block in blocks:
+            yield executor.submit(projection, block)
+
+def collect(future, expected):
+    output, skipped = future.result()
+    for ncols in skipped:
+        print('skipping: #cols = %d, expected %d' % (ncols, expected), file=sys.stderr)
+    return output
+
+def dconv(source, columns, jobs=None, chunk_size=CHUNK_SIZE, lower=True):
+    columns = [parse_column(column) for column in columns]
+    jobs = jobs or os.cpu_count()
+    pending = collections.deque()
+    with concurrent.futures.ProcessPoolExecutor(jobs) as executor:
+        chunks = submit_chunks(executor, source, columns, chunk_size, lower)
+        projection = next(chunks, None)
+        if projection is None:
+            return
+        yield projection.header
+        for future in chunks:
+            pending.append(future)
+            if len(pending) > 2 * jobs:
+                yield collect(pending.popleft(), projection.ncols)
+        while pending:
+            yield collect(pending.popleft(), projection.ncols)
+
+def convert(source, out, columns, **kwargs):
+    for data in dconv(source, columns, **kwargs):
+        out.write(data)
+
+def main():
+    parser = argparse.ArgumentParser(
+            description='extract and rename columns of tab or space separated files')
+    parser.add_argument('columns', metavar='COLUMN', nargs='+',
+            help='<key>, <src>:<dst> or <dst>=<value>')
+    parser.add_argument('-i', '--input', metavar='FILE',
+            help='input file (default stdin)')
+    parser.add_argument('-j', '--jobs', metavar='N', type=int,
+            help='number of worker processes')
+    parser.add_argument('-c', '--chunk-size', metavar='BYTES', type=int,
+            default=CHUNK_SIZE, help='bytes per chunk')
+    parser.add_argument('--keep-case', action='store_true',
+            help='do not lowercase the data')
+    options = parser.parse_args()
+    source = options.input or sys.stdin.buffer
+    try:
+        convert(source, sys.stdout.buffer, options.columns, jobs=options.jobs,
+                chunk_size=options.chunk_size, lower=not options.keep_case)
+    except ValueError as ex:
+        print(ex, file=sys.stderr)
+        exit(1)
+
+if __name__ == '__main__':
+    main()
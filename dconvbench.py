@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import itertools
+import subprocess
+
+import dconv
+
+NCOLS = 12
+COLUMNS = ['c3', 'c0:snp', 'c7:pos', 'c11', 'c5']
+
+def generate(path, size, sep, seed=0):
+    rng = random.Random(seed)
+    seps = [b' ', b'\t'] if sep == 'mixed' else [b'\t' if sep == 'tab' else b' ']
+    header = b' '.join(b'c%d' % i for i in range(NCOLS)) + b'\n'
+    lines = []
+    for i in range(10000):
+        fields = [b'rs%d' % rng.randrange(10**8), b'%d' % rng.randrange(23),
+                  b'%d' % rng.randrange(10**9), rng.choice([b'A', b'C', b'G', b'T'])]
+        fields += [b'%.6f' % rng.random() for _ in range(NCOLS - len(fields))]
+        lines.append(rng.choice(seps).join(fields) + b'\n')
+    block = b''.join(lines)
+    with open(path, 'wb') as f:
+        f.write(header)
+        written = len(header)
+        while written < size:
+            f.write(block)
+            written += len(block)
+    return written
+
+def run_c(binary, path, out):
+    with open(path, 'rb') as stdin, open(out, 'wb') as stdout:
+        subprocess.run([binary] + COLUMNS, stdin=stdin, stdout=stdout, check=True)
+
+def run_python(path, out, jobs, chunk_size):
+    with open(out, 'wb') as stdout:
+        dconv.convert(path, stdout, COLUMNS, jobs=jobs, chunk_size=chunk_size)
+
+def same_output(a, b):
+    with open(a, 'rb') as fa, open(b, 'rb') as fb:
+        for line_a, line_b in itertools.zip_longest(fa, fb):
+            if line_a is None or line_b is None or line_a.rstrip() != line_b.rstrip():
+                return False
+        return True
+
+def timed(label, size, f, *args):
+    start = time.perf_counter()
+    f(*args)
+    elapsed = time.perf_counter() - start
+    print('%-8s %8.2fs %8.1f MB/s' % (label, elapsed, size / elapsed / 1e6))
+
+def main():
+    parser = argparse.ArgumentParser(description='benchmark dconv.c against dconv.py')
+    parser.add_argument('-s', '--size', metavar='GB', type=float, default=2,
+            help='size of the generated input in GB')
+    parser.add_argument('--sep', choices=['space', 'tab', 'mixed'], default='mixed',
+            help='column separator of the generated input')
+    parser.add_argument('-j', '--jobs', metavar='N', type=int,
+            help='number of worker processes for dconv.py')
+    parser.add_argument('-c', '--chunk-size', metavar='BYTES', type=int,
+            default=dconv.CHUNK_SIZE, help='bytes per chunk for dconv.py')
+    parser.add_argument('-b', '--binary', metavar='FILE', default='bin/dconv',
+            help='compiled dconv.c (see Makefile)')
+    parser.add_argument('-d', '--dir', metavar='DIR',
+            help='directory for the generated files (default a temporary one)')
+    parser.add_argument('--no-verify', action='store_true',
+            help='do not compare the outputs')
+    options = parser.parse_args()
+    if not os.path.exists(options.binary):
+        print('%s not found, run make dconv first' % options.binary, file=sys.stderr)
+        exit(1)
+    with tempfile.TemporaryDirectory(dir=options.dir) as directory:
+        path = os.path.join(directory, 'input.txt')
+        out_c = os.path.join(directory, 'out-c.txt')
+        out_py = os.path.join(directory, 'out-py.txt')
+        size = generate(path, int(options.size * 1e9), options.sep)
+        print('input    %8.2f GB, %s separated' % (size / 1e9, options.sep))
+        timed('dconv.c', size, run_c, options.binary, path, out_c)
+        timed('dconv.py', size, run_python, path, out_py, options.jobs, options.chunk_size)
+        if not options.no_verify:
+            if not same_output(out_c, out_py):
+                print('outputs differ', file=sys.stderr)
+                exit(1)
+            print('outputs match')
+
+if __name__ == '__main__':
+    main()